@@ -1,38 +1,164 @@
 """
 Configuration management
 Loads settings from environment variables
+
+Settings are read lazily on first access (including the .env file),
+parsed to their declared type once and cached. Performance settings
+can be overridden per source or stage by prefixing the variable with
+the scope name, e.g. CUSTOMERS_BATCH_SIZE overrides BATCH_SIZE when
+loading customers.
 """
 
+import math
 import os
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 
-class Config:
-    """Application configuration"""
-    
+# name: (type, default[, maximum]); numeric settings must be positive and finite
+SETTINGS = {
     # Database
-    DB_HOST = os.getenv('DB_HOST', 'localhost')
-    DB_PORT = os.getenv('DB_PORT', '5432')
-    DB_NAME = os.getenv('DB_NAME', 'integration_db')
-    DB_USER = os.getenv('DB_USER', 'postgres')
-    DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-    
+    'DB_HOST': (str, 'localhost'),
+    'DB_PORT': (int, 5432, 65535),
+    'DB_NAME': (str, 'integration_db'),
+    'DB_USER': (str, 'postgres'),
+    'DB_PASSWORD': (str, ''),
+
     # API
-    API_BASE_URL = os.getenv('API_BASE_URL', 'https://jsonplaceholder.typicode.com')
-    API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))
-    
+    'API_BASE_URL': (str, 'https://jsonplaceholder.typicode.com'),
+    'API_TIMEOUT': (int, 30),
+
     # File paths
-    DATA_DIR = 'data'
-    CUSTOMERS_FILE = 'data/customers.csv'
-    
+    'DATA_DIR': (str, 'data'),
+    'CUSTOMERS_FILE': (str, 'data/customers.csv'),
+    'SPILL_DIR': (str, None),  # None: system temp dir
+
+    # Performance tuning
+    'CHUNK_SIZE': (int, 100000),
+    'SPILL_PARTITIONS': (int, 64),
+    'BATCH_SIZE': (int, 500),
+    'MIN_BATCH_SIZE': (int, 50),
+    'MAX_BATCH_SIZE': (int, 10000),
+    'BATCH_TARGET_LATENCY': (float, 2.0),
+    'NORMALIZE_CACHE_SIZE': (int, 100000),
+}
+
+# Prefixes accepted for per-source / per-stage overrides
+SCOPES = ('customers', 'products', 'extract', 'transform', 'validate', 'load')
+
+
+class Config:
+    """Application configuration"""
+
+    def __init__(self):
+        self._env = None
+        self._values = {}
+
+    def _load(self):
+        """Read the environment (and .env) once"""
+        if self._env is None:
+            load_dotenv()
+            keys = set(SETTINGS)
+            keys.update(f"{scope.upper()}_{name}" for scope in SCOPES for name in SETTINGS)
+            self._env = {key: os.environ[key] for key in keys if key in os.environ}
+        return self._env
+
+    def _parse(self, key, raw, type_, maximum=None):
+        """Convert a raw environment value to its declared type and check its bounds"""
+        try:
+            value = type_(raw)
+        except ValueError:
+            raise ValueError(f"Invalid setting {key}={raw!r}: expected {type_.__name__}") from None
+        if type_ in (int, float):
+            if not math.isfinite(value):
+                raise ValueError(f"Invalid setting {key}={raw!r}: must be finite")
+            if value <= 0:
+                raise ValueError(f"Invalid setting {key}={raw!r}: must be positive")
+            if maximum is not None and value > maximum:
+                raise ValueError(f"Invalid setting {key}={raw!r}: must be at most {maximum}")
+        return value
+
+    def get(self, name, *scopes):
+        """
+        Get a setting, preferring per-scope overrides
+
+        Args:
+            name (str): Setting name, e.g. 'BATCH_SIZE'
+            *scopes (str): Sources/stages to check first, in order,
+                e.g. ('customers', 'load') checks CUSTOMERS_BATCH_SIZE,
+                then LOAD_BATCH_SIZE, then BATCH_SIZE
+
+        Returns:
+            Typed setting value
+        """
+        if name not in SETTINGS:
+            raise KeyError(f"Unknown setting: {name}")
+        for scope in scopes:
+            if scope not in SCOPES:
+                raise KeyError(f"Unknown setting scope: {scope}")
+
+        cache_key = (name,) + scopes
+        if cache_key in self._values:
+            return self._values[cache_key]
+
+        type_, default, *bounds = SETTINGS[name]
+        env = self._load()
+        value = default
+        for key in [f"{scope.upper()}_{name}" for scope in scopes] + [name]:
+            if key in env:
+                value = self._parse(key, env[key], type_, *bounds)
+                break
+
+        self._values[cache_key] = value
+        return value
+
+    def batch_settings(self, *scopes):
+        """
+        Adaptive batching settings, checked for consistency
+
+        Args:
+            *scopes (str): Sources/stages to check first, as in get()
+
+        Returns:
+            dict: AdaptiveBatcher keyword arguments
+        """
+        settings = {
+            'initial_size': self.get('BATCH_SIZE', *scopes),
+            'min_size': self.get('MIN_BATCH_SIZE', *scopes),
+            'max_size': self.get('MAX_BATCH_SIZE', *scopes),
+            'target_latency': self.get('BATCH_TARGET_LATENCY', *scopes),
+        }
+        if not settings['min_size'] <= settings['initial_size'] <= settings['max_size']:
+            scope = f" for {'/'.join(scopes)}" if scopes else ""
+            raise ValueError(
+                f"Invalid batch settings{scope}: need MIN_BATCH_SIZE <= BATCH_SIZE <= MAX_BATCH_SIZE, "
+                f"got {settings['min_size']} / {settings['initial_size']} / {settings['max_size']}"
+            )
+        return settings
+
+    def __getattr__(self, name):
+        if name in SETTINGS:
+            return self.get(name)
+        raise AttributeError(name)
+
+    def __getstate__(self):
+        # Worker processes receive the values already read here,
+        # so they never re-read the environment or .env
+        return {'_env': self._load(), '_values': dict(self._values)}
+
+    def __setstate__(self, state):
+        self._env = state['_env']
+        self._values = state['_values']
+
     @property
     def db_connection_string(self):
         """PostgreSQL connection string"""
-        return f"host={self.DB_HOST} port={self.DB_PORT} dbname={self.DB_NAME} user={self.DB_USER} password={self.DB_PASSWORD}"
+        if 'db_connection_string' not in self._values:
+            self._values['db_connection_string'] = (
+                f"host={self.DB_HOST} port={self.DB_PORT} dbname={self.DB_NAME} "
+                f"user={self.DB_USER} password={self.DB_PASSWORD}"
+            )
+        return self._values['db_connection_string']
 
 
 # Create config instance
-config = Config()
\ No newline at end of file
+config = Config()
@@ -4,23 +4,45 @@ Runs the complete multi-source integration pipeline
 """
 
 from datetime import datetime
-from src.extract_csv import extract_customers
+from config import config
+from src.extract_csv import extract_customers, extract_customers_chunks
 from src.extract_api import extract_products
-from src.transform import transform_customers, transform_products
-from src.validate import validate_customers, validate_products
+from src.transform import transform_customers, transform_customers_chunks, transform_products
+from src.validate import validate_customers, validate_customers_chunks, validate_products
 from src.load import DataLoader
+from src.dedup import ChunkSpill
 
 
-def run_pipeline():
-    """Execute the complete ETL pipeline"""
+def run_pipeline(loader=None, session=None, out_of_core=False, chunk_size=None,
+                 customers_file=None, spill_partitions=None):
+    """
+    Execute the complete ETL pipeline
+    
+    Args:
+        loader (DataLoader): Optional loader to reuse; it is left connected
+        session (requests.Session): Optional HTTP session to reuse
+        out_of_core (bool): Stream customers in chunks with bounded memory
+        chunk_size (int): Rows per chunk in out-of-core mode (default: CHUNK_SIZE setting)
+        customers_file (str): Customer CSV (default: CUSTOMERS_FILE setting)
+        spill_partitions (int): Dedup spill partitions in out-of-core mode
+            (default: SPILL_PARTITIONS setting)
+        
+    Returns:
+        bool: True if the pipeline succeeded
+    """
     
     start_time = datetime.now()
     
+    if customers_file is None:
+        customers_file = config.CUSTOMERS_FILE
+    
     print("\n" + "="*60)
     print("🚀 MULTI-SOURCE INTEGRATION PIPELINE")
     print("="*60)
     print(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
     
+    spill = None
+    
     try:
         # ============================================
         # STEP 1: EXTRACT
@@ -29,11 +51,14 @@ def run_pipeline():
         print("STEP 1: EXTRACT DATA")
         print("="*60)
         
-        # Extract from CSV
-        customers_raw = extract_customers()
+        # Extract from CSV (lazily, chunk by chunk, in out-of-core mode)
+        if out_of_core:
+            customers_raw = extract_customers_chunks(customers_file, chunksize=chunk_size)
+        else:
+            customers_raw = extract_customers(customers_file)
         
         # Extract from API
-        products_raw = extract_products()
+        products_raw = extract_products(session=session)
         
         # ============================================
         # STEP 2: TRANSFORM
@@ -42,7 +67,10 @@ def run_pipeline():
         print("STEP 2: TRANSFORM DATA")
         print("="*60)
         
-        customers_clean = transform_customers(customers_raw)
+        if out_of_core:
+            customers_clean = transform_customers_chunks(customers_raw, partitions=spill_partitions)
+        else:
+            customers_clean = transform_customers(customers_raw)
         products_clean = transform_products(products_raw)
         
         # ============================================
@@ -52,7 +80,14 @@ def run_pipeline():
         print("STEP 3: VALIDATE DATA")
         print("="*60)
         
-        customers_valid = validate_customers(customers_clean)
+        if out_of_core:
+            # Spill cleaned chunks so they can be loaded after validation
+            spill = ChunkSpill()
+            customers_valid = validate_customers_chunks(spill.tee(customers_clean),
+                                                        partitions=spill_partitions)
+            customers_clean = spill
+        else:
+            customers_valid = validate_customers(customers_clean)
         products_valid = validate_products(products_clean)
         
         if not customers_valid or not products_valid:
@@ -65,15 +100,22 @@ def run_pipeline():
         print("STEP 4: LOAD TO DATABASE")
         print("="*60)
         
-        loader = DataLoader()
-        loader.connect()
+        owns_loader = loader is None
+        if owns_loader:
+            loader = DataLoader()
+        loader.ensure_connected()
+        loader.reset_batch_stats()
         
         try:
-            loader.load_customers(customers_clean)
+            if out_of_core:
+                loader.load_customers_chunks(customers_clean)
+            else:
+                loader.load_customers(customers_clean)
             loader.load_products(products_clean)
             loader.get_stats()
         finally:
-            loader.disconnect()
+            if owns_loader:
+                loader.disconnect()
         
         # ============================================
         # SUCCESS
@@ -106,10 +148,51 @@ def run_pipeline():
         print("   3. Check data files exist in data/")
         
         return False
+    
+    finally:
+        if spill is not None:
+            spill.close()
 
 
 if __name__ == '__main__':
-    success = run_pipeline()
+    import argparse
+    from functools import partial
+    
+    parser = argparse.ArgumentParser(description="Multi-source integration pipeline")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Keep running with warm connections")
+    parser.add_argument('--interval', type=float, default=None,
+                        help="Daemon: seconds between scheduled runs")
+    parser.add_argument('--watch', action='store_true',
+                        help="Daemon: run when the customers file changes")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="Stream customers in chunks for inputs larger than RAM")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Rows per chunk in out-of-core mode (default: CHUNK_SIZE setting)")
+    parser.add_argument('--spill-partitions', type=int, default=None,
+                        help="Dedup spill partitions in out-of-core mode (default: SPILL_PARTITIONS setting)")
+    parser.add_argument('--port', type=int, default=None,
+                        help="Daemon: local health/metrics port (default 8765, 0 to disable)")
+    args = parser.parse_args()
+    
+    if not args.daemon:
+        daemon_only = [flag for flag, value in [('--interval', args.interval is not None),
+                                                ('--watch', args.watch),
+                                                ('--port', args.port is not None)] if value]
+        if daemon_only:
+            parser.error(f"{', '.join(daemon_only)} only apply with --daemon")
+    
+    run = partial(run_pipeline, out_of_core=args.out_of_core, chunk_size=args.chunk_size,
+                  spill_partitions=args.spill_partitions)
+    
+    if args.daemon:
+        from src.daemon import PipelineDaemon
+        port = 8765 if args.port is None else args.port
+        PipelineDaemon(run=run, interval=args.interval,
+                       watch=args.watch, port=port).serve_forever()
+        exit(0)
+    
+    success = run()
     
     if not success:
         exit(1)
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Batching Module
+Adaptive batch sizing for database loads
+"""
+
+import time
+
+
+class AdaptiveBatcher:
+    """
+    Sizes insert batches at runtime using AIMD
+    (additive increase, multiplicative decrease).
+
+    The batch size grows by a fixed step while batches finish under the
+    target latency and throughput keeps up, and is cut by a factor when a
+    batch is too slow, throughput drops, or the statement fails.
+
+    Throughput is compared against a moving average (EWMA) rather than
+    the all-time peak. The average is reset after each decrease, because
+    smaller batches have lower rows/sec (fixed per-statement cost) and
+    must not be judged against the rate of larger ones.
+    """
+
+    def __init__(self, initial_size=500, min_size=50, max_size=10000,
+                 increase_step=250, decrease_factor=0.5,
+                 target_latency=2.0, throughput_tolerance=0.2,
+                 smoothing=0.3):
+        self.batch_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.throughput_tolerance = throughput_tolerance
+        self.smoothing = smoothing
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Clear history and statistics but keep the learned batch size
+
+        Called at the start of each pipeline run so a long-lived loader
+        reports per-run numbers.
+        """
+        self.reference_throughput = None
+        self.batches = 0
+        self.min_batch_size = None
+        self.max_batch_size = 0
+        self.total_rows = 0
+        self.total_seconds = 0.0
+        self.decreases = 0
+
+    def record(self, rows, seconds):
+        """
+        Record a completed batch and adjust the batch size
+
+        Args:
+            rows (int): Rows written in the batch
+            seconds (float): Time the batch took
+        """
+        self.batches += 1
+        self.min_batch_size = rows if self.min_batch_size is None else min(self.min_batch_size, rows)
+        self.max_batch_size = max(self.max_batch_size, rows)
+        self.total_rows += rows
+        self.total_seconds += seconds
+
+        throughput = rows / seconds if seconds > 0 else float('inf')
+        too_slow = seconds > self.target_latency
+        degraded = (self.reference_throughput is not None
+                    and throughput < self.reference_throughput * (1 - self.throughput_tolerance))
+        if self.reference_throughput is None:
+            self.reference_throughput = throughput
+        else:
+            self.reference_throughput = (self.smoothing * throughput
+                                         + (1 - self.smoothing) * self.reference_throughput)
+
+        # Only adjust when the batch was full-sized (the last one may be short)
+        if rows < self.batch_size and not too_slow:
+            return
+
+        if too_slow or degraded:
+            self.decrease()
+        else:
+            self.batch_size = min(self.max_size, self.batch_size + self.increase_step)
+
+    def record_failure(self):
+        """
+        Shrink the batch size after a failed batch (e.g. statement timeout)
+
+        Returns:
+            bool: False if already at the minimum size and cannot shrink
+        """
+        if self.batch_size <= self.min_size:
+            return False
+        self.decrease()
+        return True
+
+    def decrease(self):
+        """Apply the multiplicative decrease"""
+        self.batch_size = max(self.min_size, int(self.batch_size * self.decrease_factor))
+        self.decreases += 1
+        # Re-learn the throughput at the new size
+        self.reference_throughput = None
+
+    def summary(self):
+        """
+        Summarize the batch sizes chosen
+
+        Returns:
+            dict: Batch statistics
+        """
+        return {
+            'batches': self.batches,
+            'rows': self.total_rows,
+            'final_batch_size': self.batch_size,
+            'min_batch_size': self.min_batch_size or 0,
+            'max_batch_size': self.max_batch_size,
+            'decreases': self.decreases,
+            'rows_per_sec': (self.total_rows / self.total_seconds
+                             if self.total_seconds > 0 else 0.0),
+        }
+
+
+def timed(func, *args, **kwargs):
+    """
+    Run func and return its elapsed wall time in seconds
+
+    Returns:
+        float: Elapsed seconds
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
@@ -0,0 +1,359 @@
+"""
+Benchmark Module
+Query-plan and load-performance regression harness against Postgres
+
+Seeds a disposable database at scale, records EXPLAIN (ANALYZE, BUFFERS)
+for each query in sql/queries.sql and rows/sec for each DataLoader path,
+and compares the results against a stored baseline.
+
+Run: python -m src.benchmark --spawn            (throwaway local Postgres)
+     python -m src.benchmark --dsn "dbname=scratch ..."
+     python -m src.benchmark --spawn --update-baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from src.load import DataLoader
+
+SCHEMA_FILE = 'sql/schema.sql'
+QUERIES_FILE = 'sql/queries.sql'
+BASELINE_FILE = 'benchmark_baseline.json'
+
+
+class TemporaryPostgres:
+    """
+    Throwaway Postgres cluster in a temp directory (needs initdb/pg_ctl on PATH)
+
+    Usage:
+        with TemporaryPostgres() as dsn:
+            ...
+    """
+
+    def __init__(self):
+        self.data_dir = None
+        self.port = None
+
+    def __enter__(self):
+        initdb = shutil.which('initdb')
+        pg_ctl = shutil.which('pg_ctl')
+        if not initdb or not pg_ctl:
+            raise RuntimeError("initdb/pg_ctl not found on PATH; use --dsn instead")
+
+        self.data_dir = tempfile.mkdtemp(prefix='bench_pg_')
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            self.port = s.getsockname()[1]
+
+        try:
+            subprocess.run(
+                [initdb, '-D', self.data_dir, '-U', 'postgres', '-A', 'trust'],
+                check=True, capture_output=True,
+            )
+            subprocess.run(
+                [pg_ctl, '-D', self.data_dir, '-w', '-l', os.path.join(self.data_dir, 'server.log'),
+                 '-o', f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1", 'start'],
+                check=True, capture_output=True,
+            )
+        except BaseException:
+            # __exit__ does not run when __enter__ fails
+            self._cleanup()
+            raise
+        return f"host=127.0.0.1 port={self.port} dbname=postgres user=postgres"
+
+    def __exit__(self, *exc):
+        self._cleanup()
+
+    def _cleanup(self):
+        """Stop the server (if it started) and remove the data directory"""
+        pg_ctl = shutil.which('pg_ctl')
+        if pg_ctl and os.path.exists(os.path.join(self.data_dir, 'postmaster.pid')):
+            subprocess.run(
+                [pg_ctl, '-D', self.data_dir, '-m', 'immediate', 'stop'],
+                capture_output=True,
+            )
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+def parse_queries(sql_text):
+    """
+    Split a SQL file into named statements
+
+    The name of each statement is the last '--' comment before it.
+
+    Args:
+        sql_text (str): Contents of a .sql file
+
+    Returns:
+        list: (name, sql) tuples
+    """
+    queries = []
+    for i, block in enumerate(sql_text.split(';')):
+        name = None
+        lines = []
+        for line in block.splitlines():
+            stripped = line.strip()
+            if stripped.startswith('--'):
+                comment = stripped.lstrip('-').strip()
+                if comment and not set(comment) <= {'='}:
+                    name = comment
+            elif stripped:
+                lines.append(line)
+        if lines:
+            queries.append((name or f'query_{i + 1}', '\n'.join(lines)))
+    return queries
+
+
+def parse_index_names(sql_text):
+    """
+    Index names created in a schema file
+
+    Returns:
+        list: Index names
+    """
+    return re.findall(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(\w+)', sql_text, re.IGNORECASE)
+
+
+def summarize_plan(explain_json):
+    """
+    Extract the fields we track from EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+
+    Args:
+        explain_json (list): Parsed EXPLAIN output
+
+    Returns:
+        dict: Execution time, node types, indexes used and buffer counts
+    """
+    top = explain_json[0]
+    node_types = set()
+    indexes = set()
+
+    def walk(node):
+        node_types.add(node['Node Type'])
+        if 'Index Name' in node:
+            indexes.add(node['Index Name'])
+        for child in node.get('Plans', []):
+            walk(child)
+
+    plan = top['Plan']
+    walk(plan)
+    return {
+        'execution_ms': top['Execution Time'],
+        'node_types': sorted(node_types),
+        'indexes': sorted(indexes),
+        'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+    }
+
+
+def make_customers(n, seed=0):
+    """Synthetic customer rows in the shape transform_customers produces"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    countries = np.array(['USA', 'Canada', 'UK', 'Germany', 'France', 'India', 'Japan', 'Brazil'])
+    return pd.DataFrame({
+        'customer_id': ids,
+        'name': [f'Customer {i}' for i in ids],
+        'email': [f'customer{i}@example.com' for i in ids],
+        'signup_date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, n), unit='D'),
+        'country': countries[rng.integers(0, len(countries), n)],
+    })
+
+
+def make_products(n, seed=0):
+    """Synthetic product rows in the shape transform_products produces"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    return pd.DataFrame({
+        'product_id': ids,
+        'name': [f'Product {i}' for i in ids],
+        'price': rng.uniform(1, 1000, n).round(2),
+        'category': [f'Category {i}' for i in rng.integers(0, 50, n)],
+    })
+
+
+def run_benchmark(dsn, customers=200000, products=20000, repeats=3, chunk_size=None):
+    """
+    Seed the database and measure loads and query plans
+
+    Args:
+        dsn (str): Connection string of a disposable database
+        customers (int): Customer rows to seed
+        products (int): Product rows to seed
+        repeats (int): Runs per load path and query (fastest is kept)
+        chunk_size (int): Rows per chunk for load_customers_chunks
+            (default: CHUNK_SIZE setting)
+
+    Returns:
+        dict: Results keyed by 'loads', 'queries' and 'unused_indexes'
+    """
+    schema_sql = Path(SCHEMA_FILE).read_text()
+    queries = parse_queries(Path(QUERIES_FILE).read_text())
+
+    loader = DataLoader(dsn=dsn)
+    loader.connect()
+    try:
+        loader.cursor.execute(schema_sql)
+        loader.conn.commit()
+
+        if chunk_size is None:
+            chunk_size = config.get('CHUNK_SIZE', 'customers', 'extract')
+        customers_df = make_customers(customers)
+        customer_chunks = [customers_df.iloc[i:i + chunk_size]
+                           for i in range(0, len(customers_df), chunk_size)]
+
+        # Repeated loads upsert the same rows, so every run does equal work
+        loads = {}
+        for name, method, data, rows in [
+            ('load_customers', loader.load_customers, customers_df, customers),
+            ('load_customers_chunks', loader.load_customers_chunks, customer_chunks, customers),
+            ('load_products', loader.load_products, make_products(products), products),
+        ]:
+            seconds = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                method(data)
+                seconds.append(time.perf_counter() - start)
+            loads[name] = {'rows': rows, 'rows_per_sec': rows / min(seconds)}
+
+        loader.cursor.execute("ANALYZE")
+        loader.conn.commit()
+
+        results = {}
+        for name, sql in queries:
+            runs = []
+            for _ in range(repeats):
+                loader.cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+                runs.append(summarize_plan(loader.cursor.fetchone()[0]))
+            results[name] = min(runs, key=lambda r: r['execution_ms'])
+        loader.conn.rollback()
+
+        used = {idx for r in results.values() for idx in r['indexes']}
+        unused = [idx for idx in parse_index_names(schema_sql) if idx not in used]
+    finally:
+        loader.disconnect()
+
+    return {'loads': loads, 'queries': results, 'unused_indexes': unused}
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=5.0):
+    """
+    Compare results against a baseline
+
+    Flags queries that stopped using an index or got slower by more than
+    both the tolerance and min_delta_ms (small queries are noisy), and
+    load paths whose throughput dropped by more than the tolerance.
+
+    Args:
+        results (dict): Output of run_benchmark
+        baseline (dict): Previously stored results
+        tolerance (float): Allowed relative slowdown
+        min_delta_ms (float): Query slowdowns below this are ignored
+
+    Returns:
+        list: Regression messages (empty if none)
+    """
+    regressions = []
+
+    for name, base in baseline.get('queries', {}).items():
+        current = results['queries'].get(name)
+        if current is None:
+            regressions.append(f"{name}: query missing from {QUERIES_FILE}")
+            continue
+        lost = sorted(set(base['indexes']) - set(current['indexes']))
+        if lost:
+            regressions.append(f"{name}: no longer uses index {', '.join(lost)}")
+        slowdown = current['execution_ms'] - base['execution_ms']
+        if slowdown > base['execution_ms'] * tolerance and slowdown > min_delta_ms:
+            regressions.append(
+                f"{name}: {current['execution_ms']:.2f} ms vs baseline {base['execution_ms']:.2f} ms"
+            )
+
+    for name, base in baseline.get('loads', {}).items():
+        current = results['loads'].get(name)
+        if current is None:
+            regressions.append(f"{name}: load path missing from results")
+            continue
+        if current['rows_per_sec'] < base['rows_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['rows_per_sec']:,.0f} rows/sec "
+                f"vs baseline {base['rows_per_sec']:,.0f} rows/sec"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query-plan and load regression harness")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--dsn', help="Disposable database to use (its tables are dropped)")
+    target.add_argument('--spawn', action='store_true', help="Start a throwaway local Postgres")
+    parser.add_argument('--customers', type=int, default=200000)
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-delta-ms', type=float, default=5.0)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("📈 PERFORMANCE REGRESSION HARNESS")
+    print("="*60)
+
+    def run(dsn):
+        return run_benchmark(dsn, args.customers, args.products, args.repeats, args.chunk_size)
+
+    if args.spawn:
+        with TemporaryPostgres() as dsn:
+            results = run(dsn)
+    else:
+        results = run(args.dsn)
+
+    print("\n📥 Loads:")
+    for name, load in results['loads'].items():
+        print(f"   {name}: {load['rows']:,} rows, {load['rows_per_sec']:,.0f} rows/sec")
+    print("\n🔎 Queries:")
+    for name, plan in results['queries'].items():
+        indexes = ', '.join(plan['indexes']) or 'none'
+        print(f"   {name}: {plan['execution_ms']:.2f} ms, indexes: {indexes}")
+    if results['unused_indexes']:
+        print(f"\n💡 Indexes not used by any query: {', '.join(results['unused_indexes'])}")
+
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"\n✅ Baseline written to {args.baseline}")
+        return True
+
+    if not Path(args.baseline).exists():
+        print(f"\n⚠️  No baseline at {args.baseline}; run with --update-baseline first")
+        return True
+
+    regressions = compare(results, json.loads(Path(args.baseline).read_text()),
+                          args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ Found {len(regressions)} regressions:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return False
+
+    print("\n✅ No regressions against baseline")
+    return True
+
+
+if __name__ == '__main__':
+    if not main():
+        exit(1)
@@ -0,0 +1,213 @@
+"""
+Daemon Module
+Long-lived pipeline process with warm connections and scheduled runs
+"""
+
+import json
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from config import config
+from src.load import DataLoader
+
+
+class PipelineDaemon:
+    """
+    Runs the pipeline repeatedly in one process
+
+    Modules stay imported and the database connection and HTTP session
+    are reused between runs. A run is triggered every `interval` seconds
+    and/or when a watched file changes.
+    """
+
+    def __init__(self, run=None, interval=None, watch=False, customers_file=None,
+                 port=8765, poll_seconds=1.0):
+        """
+        Args:
+            run (callable): Pipeline function taking loader, session and
+                customers_file keyword arguments (defaults to main.run_pipeline)
+            interval (float): Seconds between scheduled runs, or None
+            watch (bool): Run when a watched file is modified
+            customers_file (str): Customer CSV to process and watch
+                (default: CUSTOMERS_FILE setting)
+            port (int): Local health/metrics port, 0 to disable
+            poll_seconds (float): How often to check triggers
+        """
+        if run is None:
+            from main import run_pipeline as run
+        if interval is None and not watch:
+            raise ValueError("Daemon needs an --interval, --watch, or both")
+
+        self.run = run
+        self.interval = interval
+        self.watch = watch
+        # The same file is watched and passed to every run
+        self.customers_file = customers_file or config.CUSTOMERS_FILE
+        self.watch_paths = [Path(self.customers_file)]
+        self.port = port
+        self.poll_seconds = poll_seconds
+
+        self.loader = DataLoader()
+        self.session = requests.Session()
+        self.stop_event = threading.Event()
+        self.server = None
+        # Guards metrics, which the HTTP thread reads while runs update them
+        self.lock = threading.Lock()
+
+        self.metrics = {
+            'started_at': time.time(),
+            'runs': 0,
+            'successes': 0,
+            'failures': 0,
+            'last_trigger': None,
+            'last_run_at': None,
+            'last_duration_seconds': None,
+            'last_success': None,
+            'batch_stats': {},
+        }
+        # State of the watched files at the last poll and at the last run
+        self._last_seen = self._read_state()
+        self._handled = self._last_seen
+
+    def _read_state(self):
+        """Current (mtime, size) of the watched files, None if missing"""
+        state = {}
+        for path in self.watch_paths:
+            try:
+                stat = path.stat()
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                state[path] = None
+        return state
+
+    def _files_ready(self):
+        """
+        Check whether the watched files changed and have settled
+
+        A change only triggers once mtime and size are unchanged across
+        two consecutive polls, so a file still being written is not
+        processed half-way through.
+
+        Returns:
+            bool: True if a run should start
+        """
+        state = self._read_state()
+        settled = state == self._last_seen
+        self._last_seen = state
+
+        if not settled or state == self._handled:
+            return False
+        if any(value is None for value in state.values()):
+            return False
+        self._handled = state
+        return True
+
+    def run_once(self, trigger='manual'):
+        """
+        Run the pipeline once with the warm loader and session
+
+        Args:
+            trigger (str): What caused the run (reported in metrics)
+
+        Returns:
+            bool: True if the run succeeded
+        """
+        start = time.perf_counter()
+        run_at = time.time()
+
+        try:
+            success = self.run(loader=self.loader, session=self.session,
+                               customers_file=self.customers_file)
+        except Exception as e:
+            print(f"❌ Daemon run failed: {e}")
+            success = False
+
+        if not success:
+            # Drop a possibly broken connection; the next run reconnects
+            self.loader.disconnect()
+
+        # Publish a snapshot; the HTTP thread never touches the loader
+        batch_stats = {
+            table: batcher.summary()
+            for table, batcher in self.loader.batch_stats.items()
+        }
+        with self.lock:
+            self.metrics['runs'] += 1
+            self.metrics['successes' if success else 'failures'] += 1
+            self.metrics['last_trigger'] = trigger
+            self.metrics['last_run_at'] = run_at
+            self.metrics['last_success'] = success
+            self.metrics['last_duration_seconds'] = round(time.perf_counter() - start, 3)
+            self.metrics['batch_stats'] = batch_stats
+        return success
+
+    def start_server(self):
+        """Start the health/metrics HTTP endpoint on localhost"""
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with daemon.lock:
+                    metrics = dict(daemon.metrics)
+
+                if self.path == '/health':
+                    healthy = metrics['last_success'] is not False
+                    body = {'status': 'ok' if healthy else 'degraded'}
+                    status = 200 if healthy else 503
+                elif self.path == '/metrics':
+                    body = metrics
+                    status = 200
+                else:
+                    body = {'error': 'not found'}
+                    status = 404
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.port = self.server.server_address[1]
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        print(f"🩺 Health endpoint: http://127.0.0.1:{self.port}/health")
+
+    def stop(self, *_):
+        """Ask the daemon loop to exit"""
+        self.stop_event.set()
+
+    def serve_forever(self):
+        """Run the trigger loop until stopped (SIGINT/SIGTERM)"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        if self.port:
+            self.start_server()
+
+        print("🔁 Pipeline daemon started")
+        next_run = time.monotonic() if self.interval is not None else None
+
+        try:
+            while not self.stop_event.is_set():
+                if next_run is not None and time.monotonic() >= next_run:
+                    self.run_once(trigger='schedule')
+                    next_run = time.monotonic() + self.interval
+                elif self.watch and self._files_ready():
+                    self.run_once(trigger='file')
+                self.stop_event.wait(self.poll_seconds)
+        finally:
+            if self.server:
+                self.server.shutdown()
+            self.loader.disconnect()
+            self.session.close()
+            print("🛑 Pipeline daemon stopped")
@@ -0,0 +1,140 @@
+"""
+Dedup Module
+Bounded-memory global dedup and uniqueness checks across chunks
+"""
+
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from config import config
+
+
+class PartitionSpill:
+    """
+    Hash-partitioned on-disk spill of DataFrame rows
+
+    Rows are routed to a partition file by a hash of their key column as
+    chunks arrive. All rows sharing a key land in the same partition, so
+    exact dedup and uniqueness checks can run one partition at a time,
+    holding roughly 1/partitions of the data in memory.
+    """
+
+    def __init__(self, partitions=64, spill_dir=None):
+        self.partitions = partitions
+        self.spill_dir = Path(tempfile.mkdtemp(prefix='dedup_spill_', dir=spill_dir or config.SPILL_DIR))
+
+    def _path(self, partition):
+        return self.spill_dir / f'part_{partition:04d}.pkl'
+
+    def add(self, df, key):
+        """
+        Spill a chunk of rows to their partitions
+
+        Args:
+            df (pd.DataFrame): Rows to spill
+            key (str): Column to partition on
+        """
+        if df.empty:
+            return
+        keys = df[key]
+        # Hash ints and floats alike so 5 and 5.0 land in the same partition
+        if pd.api.types.is_numeric_dtype(keys):
+            keys = keys.astype('float64')
+        parts = pd.util.hash_pandas_object(keys, index=False).to_numpy() % self.partitions
+        for partition, group in df.groupby(parts):
+            with open(self._path(partition), 'ab') as f:
+                pickle.dump(group, f)
+
+    def __iter__(self):
+        """Yield each non-empty partition as one DataFrame"""
+        for partition in range(self.partitions):
+            path = self._path(partition)
+            if not path.exists():
+                continue
+            frames = []
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        frames.append(pickle.load(f))
+                    except EOFError:
+                        break
+            yield pd.concat(frames)
+
+    def close(self):
+        """Remove spill files"""
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SpillSet(PartitionSpill):
+    """Exact duplicate counting for arbitrary keys via hash-partitioned spill"""
+
+    def add(self, values):
+        """
+        Spill a chunk of keys to their partitions
+
+        Args:
+            values (pd.Series): Keys (nulls are ignored)
+        """
+        values = pd.Series(values).dropna()
+        super().add(pd.DataFrame({'key': values}), 'key')
+
+    def duplicate_count(self):
+        """
+        Count keys that repeat an earlier key, like Series.duplicated().sum()
+
+        Returns:
+            int: Number of duplicate keys
+        """
+        return sum(int(part['key'].duplicated().sum()) for part in self)
+
+
+class ChunkSpill:
+    """
+    Temporary on-disk store for DataFrame chunks
+
+    Lets a chunk stream be consumed twice (e.g. validated, then loaded)
+    without holding every chunk in memory.
+    """
+
+    def __init__(self, spill_dir=None):
+        self.spill_dir = Path(tempfile.mkdtemp(prefix='chunk_spill_', dir=spill_dir or config.SPILL_DIR))
+        self.count = 0
+
+    def tee(self, chunks):
+        """
+        Write each chunk to disk while passing it through
+
+        Args:
+            chunks (iterable): DataFrame chunks
+
+        Yields:
+            pd.DataFrame: The same chunks
+        """
+        for chunk in chunks:
+            chunk.to_pickle(self.spill_dir / f'chunk_{self.count:06d}.pkl')
+            self.count += 1
+            yield chunk
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield pd.read_pickle(self.spill_dir / f'chunk_{i:06d}.pkl')
+
+    def close(self):
+        """Remove spill files"""
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -8,12 +8,13 @@ import pandas as pd
 from config import config
 
 
-def extract_products(api_url=None):
+def extract_products(api_url=None, session=None):
     """
     Extract product data from REST API
     
     Args:
         api_url (str): API endpoint URL
+        session (requests.Session): Optional session to reuse HTTP connections
         
     Returns:
         pd.DataFrame: Product data
@@ -31,9 +32,10 @@ def extract_products(api_url=None):
     
     try:
         # Make API request
-        response = requests.get(
+        http = session if session is not None else requests
+        response = http.get(
             api_url,
-            timeout=config.API_TIMEOUT
+            timeout=config.get('API_TIMEOUT', 'products', 'extract')
         )
         response.raise_for_status()
         
@@ -5,6 +5,7 @@ Reads customer data from CSV files
 
 import pandas as pd
 from pathlib import Path
+from config import config
 
 
 def extract_customers(file_path='data/customers.csv'):
@@ -44,6 +45,36 @@ def extract_customers(file_path='data/customers.csv'):
         raise
 
 
+def extract_customers_chunks(file_path='data/customers.csv', chunksize=None):
+    """
+    Extract customer data from CSV file in chunks (for files larger than RAM)
+    
+    Args:
+        file_path (str): Path to CSV file
+        chunksize (int): Rows per chunk (default: CHUNK_SIZE setting)
+        
+    Returns:
+        generator: Customer data chunks
+    """
+    # Checked here, not in the generator, so a missing file fails at extract time
+    if not Path(file_path).exists():
+        raise FileNotFoundError(f"CSV file not found: {file_path}")
+    
+    if chunksize is None:
+        chunksize = config.get('CHUNK_SIZE', 'customers', 'extract')
+    
+    print(f"📄 Streaming customers from {file_path} ({chunksize:,} rows per chunk)")
+    
+    return _read_customer_chunks(file_path, chunksize)
+
+
+def _read_customer_chunks(file_path, chunksize):
+    """Yield customer chunks with parsed signup dates"""
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        chunk['signup_date'] = pd.to_datetime(chunk['signup_date'])
+        yield chunk
+
+
 # Test function
 if __name__ == '__main__':
     print("🧪 Testing CSV extraction...")
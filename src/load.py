@@ -4,47 +4,65 @@ Loads data into PostgreSQL database
 """
 
 import psycopg2
+from psycopg2 import errors
 from psycopg2.extras import execute_values
 import pandas as pd
 from config import config
+from src.batching import AdaptiveBatcher, timed
 
 
 class DataLoader:
     """Handles loading data to PostgreSQL"""
     
-    def __init__(self):
+    CUSTOMERS_QUERY = """
+        INSERT INTO customers (customer_id, name, email, signup_date, country)
+        VALUES %s
+        ON CONFLICT (customer_id) 
+        DO UPDATE SET 
+            name = EXCLUDED.name,
+            email = EXCLUDED.email,
+            signup_date = EXCLUDED.signup_date,
+            country = EXCLUDED.country
+    """
+    
+    def __init__(self, dsn=None):
+        """
+        Args:
+            dsn (str): Connection string (defaults to config.db_connection_string)
+        """
+        self.dsn = dsn
         self.conn = None
         self.cursor = None
+        self.batch_stats = {}
     
     def connect(self):
         """Connect to database"""
         try:
-            self.conn = psycopg2.connect(config.db_connection_string)
+            self.conn = psycopg2.connect(self.dsn or config.db_connection_string)
             self.cursor = self.conn.cursor()
             print("✅ Connected to database")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             raise
     
+    def ensure_connected(self):
+        """Connect if there is no open connection (reused across daemon runs)"""
+        if self.conn is None or self.conn.closed:
+            self.connect()
+    
     def disconnect(self):
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
         if self.conn:
             self.conn.close()
+        self.conn = None
+        self.cursor = None
         print("🔌 Disconnected from database")
     
-    def load_customers(self, df):
-        """
-        Load customers to database
-        
-        Args:
-            df (pd.DataFrame): Customer data
-        """
-        print(f"\n📥 Loading {len(df)} customers to database...")
-        
-        # Prepare data
-        data = [
+    def _customer_rows(self, df):
+        """Convert customer data to row tuples"""
+        return [
             (
                 int(row['customer_id']),
                 row['name'],
@@ -54,21 +72,22 @@ class DataLoader:
             )
             for _, row in df.iterrows()
         ]
+    
+    def load_customers(self, df):
+        """
+        Load customers to database
         
-        # Insert with upsert (ON CONFLICT)
-        query = """
-            INSERT INTO customers (customer_id, name, email, signup_date, country)
-            VALUES %s
-            ON CONFLICT (customer_id) 
-            DO UPDATE SET 
-                name = EXCLUDED.name,
-                email = EXCLUDED.email,
-                signup_date = EXCLUDED.signup_date,
-                country = EXCLUDED.country
+        Args:
+            df (pd.DataFrame): Customer data
         """
+        print(f"\n📥 Loading {len(df)} customers to database...")
+        
+        # Prepare data
+        data = self._customer_rows(df)
         
+        # Insert with upsert (ON CONFLICT)
         try:
-            execute_values(self.cursor, query, data)
+            self._load_batched('customers', self.CUSTOMERS_QUERY, data)
             self.conn.commit()
             print(f"✅ Loaded {len(data)} customers")
         except Exception as e:
@@ -76,6 +95,30 @@ class DataLoader:
             print(f"❌ Failed to load customers: {e}")
             raise
     
+    def load_customers_chunks(self, chunks):
+        """
+        Load customer chunks to database in a single transaction
+        
+        Like load_customers, either every chunk is committed or none is.
+        
+        Args:
+            chunks (iterable): Customer DataFrame chunks
+        """
+        print("\n📥 Loading customer chunks to database...")
+        
+        total = 0
+        try:
+            for chunk in chunks:
+                data = self._customer_rows(chunk)
+                self._load_batched('customers', self.CUSTOMERS_QUERY, data)
+                total += len(data)
+            self.conn.commit()
+            print(f"✅ Loaded {total} customers")
+        except Exception as e:
+            self.conn.rollback()
+            print(f"❌ Failed to load customers, rolled back all chunks: {e}")
+            raise
+    
     def load_products(self, df):
         """
         Load products to database
@@ -108,7 +151,7 @@ class DataLoader:
         """
         
         try:
-            execute_values(self.cursor, query, data)
+            self._load_batched('products', query, data)
             self.conn.commit()
             print(f"✅ Loaded {len(data)} products")
         except Exception as e:
@@ -116,6 +159,46 @@ class DataLoader:
             print(f"❌ Failed to load products: {e}")
             raise
     
+    def _load_batched(self, table, query, data):
+        """
+        Insert rows in adaptively sized batches within the current transaction
+
+        Each batch runs under a savepoint so a statement timeout only
+        rolls back that batch, which is retried at a smaller size.
+
+        Args:
+            table (str): Table name, used as the stats key
+            query (str): INSERT ... VALUES %s statement
+            data (list): Row tuples
+        """
+        # Reuse the batcher across calls so chunked loads keep the learned size
+        if table not in self.batch_stats:
+            self.batch_stats[table] = AdaptiveBatcher(**config.batch_settings(table, 'load'))
+        batcher = self.batch_stats[table]
+        
+        # Advance an offset rather than re-slicing the tail (which is O(n) per batch)
+        pos = 0
+        while pos < len(data):
+            batch = data[pos:pos + batcher.batch_size]
+            self.cursor.execute("SAVEPOINT load_batch")
+            try:
+                seconds = timed(execute_values, self.cursor, query, batch,
+                                page_size=len(batch))
+            except errors.QueryCanceled:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT load_batch")
+                if not batcher.record_failure():
+                    raise
+                print(f"   ⚠️  Batch of {len(batch)} timed out, retrying with {batcher.batch_size}")
+                continue
+            self.cursor.execute("RELEASE SAVEPOINT load_batch")
+            batcher.record(len(batch), seconds)
+            pos += len(batch)
+    
+    def reset_batch_stats(self):
+        """Start a new run: clear batch statistics, keep learned batch sizes"""
+        for batcher in self.batch_stats.values():
+            batcher.reset_stats()
+    
     def get_stats(self):
         """Get database statistics"""
         print("\n📊 Database Statistics:")
@@ -127,6 +210,15 @@ class DataLoader:
             self.cursor.execute(query)
             count = self.cursor.fetchone()[0]
             print(f"   {table}: {count:,} rows")
+        
+        if self.batch_stats:
+            print("\n📦 Load Batching:")
+            for table, batcher in self.batch_stats.items():
+                stats = batcher.summary()
+                print(f"   {table}: {stats['batches']} batches, "
+                      f"final size {stats['final_batch_size']}, "
+                      f"peak size {stats['max_batch_size']}, "
+                      f"{stats['rows_per_sec']:,.0f} rows/sec")
 
 
 # Test function
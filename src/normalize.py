@@ -0,0 +1,209 @@
+"""
+Normalization Module
+Memoized string normalization for customer columns
+
+Each column is normalized over its distinct values only (customer files
+repeat the same names and emails many times), with vectorized pandas
+string ops, and the results are mapped back onto the rows. A bounded
+memo keyed on the raw string carries results across calls and chunks.
+"""
+
+from collections import OrderedDict
+
+import pandas as pd
+from config import config
+
+
+class MemoCache:
+    """
+    Bounded memo dictionary keyed on the raw string
+
+    When full, the oldest entry is evicted for each new one.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.rows = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def lookup(self, keys):
+        """
+        Split keys into cached results and misses
+
+        Args:
+            keys (list): Distinct raw strings
+
+        Returns:
+            tuple: (dict of cached results, list of missing keys)
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.data.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        self.lookups += len(keys)
+        self.hits += len(found)
+        return found, missing
+
+    def put_many(self, items):
+        """
+        Store (key, value) pairs, never holding more than max_size entries
+
+        Only the last max_size items can survive, so earlier ones are not
+        inserted at all; each remaining insert into a full cache first
+        evicts the oldest entry.
+        """
+        if self.max_size is None:
+            # Resolved on first use so importing this module stays cheap
+            self.max_size = config.get('NORMALIZE_CACHE_SIZE', 'transform')
+        items = list(items)[-self.max_size:]
+        for key, value in items:
+            if key not in self.data and len(self.data) >= self.max_size:
+                self.data.popitem(last=False)
+            self.data[key] = value
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self.data.clear()
+        self.rows = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: Counters from summarize_stats() plus the current size
+        """
+        stats = summarize_stats(self.rows, self.lookups, self.hits)
+        stats['size'] = len(self.data)
+        return stats
+
+
+def summarize_stats(rows, lookups, hits):
+    """
+    Derive the reported cache statistics from the raw counters
+
+    Each column is first reduced to its distinct values; only those are
+    looked up in the memo. Rows beyond the distinct values are repeats
+    within the same call (deduped), and are not memo hits.
+
+    Args:
+        rows (int): Non-null rows normalized
+        lookups (int): Distinct values looked up in the memo
+        hits (int): Lookups answered by the memo
+
+    Returns:
+        dict: rows, lookups, hits, misses, deduped and hit_rate
+    """
+    return {
+        'rows': rows,
+        'lookups': lookups,
+        'hits': hits,
+        'misses': lookups - hits,
+        'deduped': rows - lookups,
+        'hit_rate': hits / lookups if lookups else 0.0,
+    }
+
+
+EMAIL_CACHE = MemoCache()
+NAME_CACHE = MemoCache()
+
+
+def _normalize_column(series, cache, compute):
+    """
+    Normalize the distinct string values of a column through the cache
+
+    Args:
+        series (pd.Series): Raw values
+        cache (MemoCache): Memo for this column
+        compute (callable): Takes a Series of missing raw strings and
+            returns a list of results in the same order
+
+    Returns:
+        dict: Raw string -> result for every distinct string in series
+    """
+    keys = [value for value in pd.unique(series) if isinstance(value, str)]
+    mapping, missing = cache.lookup(keys)
+
+    if missing:
+        results = compute(pd.Series(missing, dtype=object))
+        computed = list(zip(missing, results))
+        mapping.update(computed)
+        cache.put_many(computed)
+
+    cache.rows += int(series.notna().sum())
+    return mapping
+
+
+def _compute_emails(raw):
+    clean = raw.str.lower().str.strip()
+    return list(zip(clean, clean.str.contains('@', regex=False)))
+
+
+def _compute_names(raw):
+    return raw.str.strip().str.title().tolist()
+
+
+def normalize_emails(series):
+    """
+    Lowercase, strip and validate an email column
+
+    Args:
+        series (pd.Series): Raw emails
+
+    Returns:
+        tuple: (pd.Series of normalized emails, pd.Series of bool validity)
+    """
+    mapping = _normalize_column(series, EMAIL_CACHE, _compute_emails)
+    emails = series.map({raw: clean for raw, (clean, _) in mapping.items()}).astype(series.dtype)
+    valid = series.map({raw: is_valid for raw, (_, is_valid) in mapping.items()})
+    return emails, valid.fillna(False).astype(bool)
+
+
+def normalize_names(series):
+    """
+    Strip and title-case a name column
+
+    Args:
+        series (pd.Series): Raw names
+
+    Returns:
+        pd.Series: Normalized names
+    """
+    return series.map(_normalize_column(series, NAME_CACHE, _compute_names)).astype(series.dtype)
+
+
+def cache_stats():
+    """
+    Cumulative statistics for the normalization caches
+
+    Returns:
+        dict: Per-column cache statistics
+    """
+    return {
+        'email': EMAIL_CACHE.stats(),
+        'name': NAME_CACHE.stats(),
+    }
+
+
+def stats_since(before):
+    """
+    Cache statistics for the lookups made since an earlier cache_stats()
+
+    Args:
+        before (dict): Earlier result of cache_stats()
+
+    Returns:
+        dict: Per-column statistics as returned by summarize_stats()
+    """
+    return {
+        column: summarize_stats(*(now[key] - before[column][key] for key in ('rows', 'lookups', 'hits')))
+        for column, now in cache_stats().items()
+    }
@@ -4,6 +4,9 @@ Cleans and transforms extracted data
 """
 
 import pandas as pd
+from config import config
+from src.normalize import normalize_emails, normalize_names, cache_stats, stats_since, summarize_stats
+from src.dedup import PartitionSpill
 
 
 def transform_customers(df):
@@ -19,6 +22,7 @@ def transform_customers(df):
     print("\n🔄 Transforming customers...")
     
     df_clean = df.copy()
+    cache_before = cache_stats()
     
     # Remove duplicates
     original_count = len(df_clean)
@@ -26,11 +30,30 @@ def transform_customers(df):
     if len(df_clean) < original_count:
         print(f"   Removed {original_count - len(df_clean)} duplicate customers")
     
-    # Clean email addresses (lowercase)
-    df_clean['email'] = df_clean['email'].str.lower().str.strip()
+    df_clean = _clean_customer_columns(df_clean)
     
-    # Clean names (title case)
-    df_clean['name'] = df_clean['name'].str.strip().str.title()
+    print(f"✅ Transformed {len(df_clean)} customers")
+    _print_cache_stats(stats_since(cache_before))
+    
+    return df_clean
+
+
+def _print_cache_stats(stats):
+    """Print normalization memo hit rates and in-column repeats for one transform call"""
+    print(f"   Normalization cache hit rate: "
+          f"email {stats['email']['hit_rate']:.0%}, name {stats['name']['hit_rate']:.0%}")
+    print(f"   Repeated values normalized once: "
+          f"email {stats['email']['deduped']:,} rows, name {stats['name']['deduped']:,} rows")
+
+
+def _clean_customer_columns(df_clean):
+    """Normalize customer columns in place and return the frame"""
+    
+    # Clean email addresses (lowercase, strip) - single memoized pass
+    df_clean['email'], _ = normalize_emails(df_clean['email'])
+    
+    # Clean names (strip, title case) - single memoized pass
+    df_clean['name'] = normalize_names(df_clean['name'])
     
     # Fill missing countries
     df_clean['country'] = df_clean['country'].fillna('Unknown')
@@ -38,11 +61,63 @@ def transform_customers(df):
     # Ensure correct data types
     df_clean['customer_id'] = df_clean['customer_id'].astype(int)
     
-    print(f"✅ Transformed {len(df_clean)} customers")
-    
     return df_clean
 
 
+def transform_customers_chunks(chunks, partitions=None):
+    """
+    Transform customer data chunk by chunk with exact global dedup
+    
+    Rows are first spilled to disk, hash-partitioned on customer_id, so
+    every copy of an ID lands in the same partition. Each partition is
+    then deduplicated keeping the first occurrence in input order,
+    matching drop_duplicates(subset=['customer_id']) on the full frame.
+    Only one partition is held in memory at a time. Output comes out in
+    partition order rather than input order.
+    
+    Args:
+        chunks (iterable): Raw customer DataFrame chunks
+        partitions (int): Number of spill partitions (default: SPILL_PARTITIONS setting)
+        
+    Yields:
+        pd.DataFrame: Cleaned customer data, one partition at a time
+    """
+    print("\n🔄 Transforming customers (out-of-core)...")
+    
+    if partitions is None:
+        partitions = config.get('SPILL_PARTITIONS', 'customers', 'transform')
+    
+    # Counted per partition: validation of earlier output runs in between
+    counts = {column: {'rows': 0, 'lookups': 0, 'hits': 0} for column in ('email', 'name')}
+    total = 0
+    removed = 0
+    
+    with PartitionSpill(partitions=partitions) as spill:
+        row = 0
+        for chunk in chunks:
+            # Global row number keeps first-occurrence order across chunks
+            spill.add(chunk.assign(_row=range(row, row + len(chunk))), 'customer_id')
+            row += len(chunk)
+        
+        for part in spill:
+            part = part.sort_values('_row')
+            deduped = part.drop_duplicates(subset=['customer_id']).drop(columns='_row')
+            removed += len(part) - len(deduped)
+            
+            cache_before = cache_stats()
+            df_clean = _clean_customer_columns(deduped)
+            for column, stats in stats_since(cache_before).items():
+                for key in counts[column]:
+                    counts[column][key] += stats[key]
+            total += len(df_clean)
+            yield df_clean
+    
+    if removed:
+        print(f"   Removed {removed} duplicate customers")
+    print(f"✅ Transformed {total} customers")
+    _print_cache_stats({column: summarize_stats(**count) for column, count in counts.items()})
+
+
 def transform_products(df):
     """
     Transform product data
@@ -4,6 +4,9 @@ Performs data quality checks
 """
 
 import pandas as pd
+from config import config
+from src.normalize import normalize_emails
+from src.dedup import SpillSet
 
 
 def validate_customers(df):
@@ -47,9 +50,10 @@ def validate_customers(df):
     
     # Check email format (basic)
     if 'email' in df.columns:
-        invalid_emails = df[~df['email'].str.contains('@', na=False)]
-        if len(invalid_emails) > 0:
-            errors.append(f"Found {len(invalid_emails)} invalid email formats")
+        _, valid_emails = normalize_emails(df['email'])
+        invalid_count = (~valid_emails).sum()
+        if invalid_count > 0:
+            errors.append(f"Found {invalid_count} invalid email formats")
     
     # Report results
     if errors:
@@ -62,6 +66,77 @@ def validate_customers(df):
         return True
 
 
+def validate_customers_chunks(chunks, spill_dir=None, partitions=None):
+    """
+    Validate customer data chunk by chunk with global uniqueness checks
+    
+    Runs the same checks as validate_customers, but duplicate
+    customer_ids and emails are counted through hash-partitioned
+    on-disk spills, so memory stays bounded.
+    
+    Args:
+        chunks (iterable): Customer DataFrame chunks
+        spill_dir (str): Directory for spill files (default: temp dir)
+        partitions (int): Number of spill partitions (default: SPILL_PARTITIONS setting)
+        
+    Returns:
+        bool: True if validation passes
+    """
+    print("\n🔍 Validating customers data (out-of-core)...")
+    
+    required_cols = ['customer_id', 'name', 'email']
+    missing_cols = set()
+    null_counts = {col: 0 for col in required_cols}
+    invalid_emails = 0
+    total = 0
+    
+    if partitions is None:
+        partitions = config.get('SPILL_PARTITIONS', 'customers', 'validate')
+    
+    with SpillSet(partitions, spill_dir) as ids, SpillSet(partitions, spill_dir) as emails:
+        for chunk in chunks:
+            total += len(chunk)
+            missing_cols.update(col for col in required_cols if col not in chunk.columns)
+            
+            for col in required_cols:
+                if col in chunk.columns:
+                    null_counts[col] += int(chunk[col].isnull().sum())
+            
+            if 'customer_id' in chunk.columns:
+                ids.add(chunk['customer_id'])
+            
+            if 'email' in chunk.columns:
+                emails.add(chunk['email'])
+                _, valid_emails = normalize_emails(chunk['email'])
+                invalid_emails += int((~valid_emails).sum())
+        
+        dup_ids = ids.duplicate_count()
+        dup_emails = emails.duplicate_count()
+    
+    errors = []
+    if missing_cols:
+        errors.append(f"Missing columns: {sorted(missing_cols)}")
+    for col, null_count in null_counts.items():
+        if null_count > 0:
+            errors.append(f"{col} has {null_count} null values")
+    if dup_ids > 0:
+        errors.append(f"Found {dup_ids} duplicate customer IDs")
+    if dup_emails > 0:
+        errors.append(f"Found {dup_emails} duplicate emails")
+    if invalid_emails > 0:
+        errors.append(f"Found {invalid_emails} invalid email formats")
+    
+    # Report results
+    if errors:
+        print(f"⚠️  Found {len(errors)} validation issues:")
+        for error in errors:
+            print(f"   - {error}")
+        return False
+    else:
+        print(f"✅ Validation passed for customers ({total} records)")
+        return True
+
+
 def validate_products(df):
     """
     Validate product data
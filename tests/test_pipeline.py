@@ -6,10 +6,17 @@ Run: python tests/test_pipeline.py
 import sys
 sys.path.insert(0, '.')
 
+from config import Config
 from src.extract_csv import extract_customers
 from src.extract_api import extract_products
-from src.transform import transform_customers, transform_products
-from src.validate import validate_customers, validate_products
+from src.transform import transform_customers, transform_customers_chunks, transform_products
+from src.validate import validate_customers, validate_customers_chunks, validate_products
+from src.batching import AdaptiveBatcher
+from src.daemon import PipelineDaemon
+from src.dedup import SpillSet
+from src.benchmark import parse_queries, compare
+from src.normalize import (normalize_emails, normalize_names, cache_stats, stats_since,
+                           MemoCache, EMAIL_CACHE, NAME_CACHE)
 
 
 def test_csv_extraction():
@@ -66,6 +73,289 @@ def test_validation():
     print("✅ Validation test passed")
 
 
+def test_adaptive_batching():
+    """Test AIMD batch sizing"""
+    print("\n🧪 Testing adaptive batching...")
+    
+    batcher = AdaptiveBatcher(initial_size=100, min_size=10, max_size=300,
+                              increase_step=100, target_latency=1.0)
+    
+    # Fast batches grow additively up to the cap
+    batcher.record(100, 0.1)
+    assert batcher.batch_size == 200, "Batch size did not increase"
+    batcher.record(200, 0.2)
+    batcher.record(300, 0.3)
+    assert batcher.batch_size == 300, "Batch size exceeded max"
+    
+    # A slow batch halves the size
+    batcher.record(300, 5.0)
+    assert batcher.batch_size == 150, "Batch size did not decrease"
+    
+    # Failures shrink down to the minimum, then give up
+    while batcher.record_failure():
+        pass
+    assert batcher.batch_size == 10, "Batch size went below min"
+    
+    stats = batcher.summary()
+    assert stats['batches'] == 4, "Wrong batch count"
+    assert stats['min_batch_size'] == 100, "Wrong smallest batch size"
+    assert stats['max_batch_size'] == 300, "Wrong peak batch size"
+    
+    # A new run starts fresh statistics but keeps the learned size
+    batcher.reset_stats()
+    assert batcher.summary()['batches'] == 0, "Statistics were not reset"
+    assert batcher.batch_size == 10, "Learned batch size was lost"
+    
+    # A lasting server slowdown must not pin the size at min_size
+    batcher = AdaptiveBatcher(initial_size=500, min_size=50, max_size=10000)
+    for i in range(400):
+        slowdown = 1.35 if i >= 100 else 1.0
+        rows = batcher.batch_size
+        batcher.record(rows, (0.01 + rows * 1e-5) * slowdown)
+    assert batcher.batch_size >= 5000, f"Batch size stuck at {batcher.batch_size}"
+    assert batcher.decreases <= 5, f"Too many decreases: {batcher.decreases}"
+    
+    print("✅ Adaptive batching test passed")
+
+
+def test_daemon_metrics():
+    """Test daemon runs reuse the warm loader/session and report metrics"""
+    print("\n🧪 Testing pipeline daemon...")
+    import json
+    import urllib.request
+    
+    calls = []
+    
+    def fake_run(loader, session, customers_file):
+        calls.append((loader, session, customers_file))
+        return len(calls) == 1
+    
+    daemon = PipelineDaemon(run=fake_run, interval=60, watch=True,
+                            customers_file='data/customers.csv', port=0)
+    assert daemon.run_once(), "First run should succeed"
+    assert not daemon.run_once(), "Second run should fail"
+    assert calls[0] == calls[1], "Loader/session were not reused"
+    assert calls[0][2] == str(daemon.watch_paths[0]), "Daemon processes a different file than it watches"
+    
+    daemon.start_server()
+    try:
+        url = f"http://127.0.0.1:{daemon.port}/metrics"
+        metrics = json.loads(urllib.request.urlopen(url).read())
+    finally:
+        daemon.server.shutdown()
+    assert metrics['runs'] == 2, "Wrong run count"
+    assert metrics['failures'] == 1, "Wrong failure count"
+    
+    # File trigger waits until mtime and size are stable across two polls
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'customers.csv')
+        watcher = PipelineDaemon(run=fake_run, watch=True, customers_file=path, port=0)
+        assert not watcher._files_ready(), "Triggered without a file"
+        with open(path, 'w') as f:
+            f.write('customer_id,name\n')
+        assert not watcher._files_ready(), "Triggered on first sight of a new file"
+        with open(path, 'a') as f:
+            f.write('1,Alice\n')
+        assert not watcher._files_ready(), "Triggered while the file was still growing"
+        assert watcher._files_ready(), "Did not trigger once the file settled"
+        assert not watcher._files_ready(), "Triggered twice for one change"
+    
+    print("✅ Daemon test passed")
+
+
+def test_normalization():
+    """Test memoized normalization matches the pandas string chains"""
+    print("\n🧪 Testing normalization...")
+    import pandas as pd
+    
+    EMAIL_CACHE.clear()
+    NAME_CACHE.clear()
+    
+    emails = pd.Series([' Alice@Email.COM ', 'bob@email.com', ' Alice@Email.COM ', 'no-at-sign', None])
+    names = pd.Series(['  alice johnson', 'BOB smith ', '  alice johnson', None])
+    
+    clean_emails, valid = normalize_emails(emails)
+    assert clean_emails.equals(emails.str.lower().str.strip()), "Email normalization differs"
+    assert valid.tolist() == [True, True, True, False, False], "Wrong email validity"
+    assert normalize_names(names).equals(names.str.strip().str.title()), "Name normalization differs"
+    
+    # In-column repeats are deduped, not memo hits
+    stats = cache_stats()
+    assert stats['email']['hits'] == 0, "In-column repeat counted as a memo hit"
+    assert stats['email']['deduped'] == 1, "Repeated email was not deduped"
+    assert stats['name']['deduped'] == 1, "Repeated name was not deduped"
+    
+    # Per-call stats only count lookups made after the snapshot
+    before = cache_stats()
+    normalize_emails(emails)
+    since = stats_since(before)['email']
+    assert since['hits'] == 3, "Second call was not served from the memo"
+    assert since['hit_rate'] == 1.0, "Per-call stats include earlier lookups"
+    
+    # Overflowing the cache stays correct and bounded while inserting
+    from collections import OrderedDict
+    
+    class TrackedDict(OrderedDict):
+        peak = 0
+        evictions = 0
+        
+        def __setitem__(self, key, value):
+            super().__setitem__(key, value)
+            self.peak = max(self.peak, len(self))
+        
+        def popitem(self, last=True):
+            assert not last, "Eviction did not pop the oldest entry"
+            self.evictions += 1
+            return super().popitem(last=last)
+    
+    EMAIL_CACHE.clear()
+    EMAIL_CACHE.max_size = 1000
+    EMAIL_CACHE.data = TrackedDict()
+    try:
+        many = pd.Series([f' User{i}@Example.com ' for i in range(5000)] * 2)
+        clean_many, valid_many = normalize_emails(many)
+        assert clean_many.equals(many.str.lower().str.strip()), "Wrong results after eviction"
+        assert valid_many.all(), "Wrong validity after eviction"
+        assert EMAIL_CACHE.data.peak == 1000, "Cache grew past max_size while inserting"
+        assert EMAIL_CACHE.data.evictions == 0, "Values that could not survive were inserted"
+        
+        # Each further insert evicts exactly one oldest entry (O(1) per insert)
+        normalize_emails(pd.Series([f'new{i}@example.com' for i in range(10)]))
+        assert EMAIL_CACHE.data.evictions == 10, "Eviction was not one popitem per insert"
+        assert EMAIL_CACHE.data.peak == 1000, "Cache grew past max_size while evicting"
+    finally:
+        EMAIL_CACHE.data = OrderedDict()
+        EMAIL_CACHE.clear()
+        EMAIL_CACHE.max_size = None
+    
+    print("✅ Normalization test passed")
+
+
+def test_out_of_core_dedup():
+    """Test chunked transform/validate match the in-memory versions"""
+    print("\n🧪 Testing out-of-core dedup...")
+    import pandas as pd
+    
+    customers = extract_customers()
+    # Repeat rows so duplicates span chunk boundaries
+    customers_dup = pd.concat([customers, customers.iloc[::3]], ignore_index=True)
+    chunks = [customers_dup.iloc[i:i + 7] for i in range(0, len(customers_dup), 7)]
+    
+    expected = transform_customers(customers_dup)
+    streamed = pd.concat(list(transform_customers_chunks(chunks, partitions=4))).sort_index()
+    assert streamed.equals(expected), "Chunked transform differs from in-memory"
+    
+    assert validate_customers_chunks([streamed.iloc[:10], streamed.iloc[10:]]), \
+        "Chunked validation failed on clean data"
+    assert not validate_customers_chunks(chunks), "Chunked validation missed duplicates"
+    
+    # Anything the in-memory path accepts, including negative and huge IDs
+    odd = customers.head(4).copy()
+    odd['customer_id'] = [-1, 3000000000, -1, 7]
+    expected = transform_customers(odd)
+    streamed = pd.concat(list(transform_customers_chunks([odd.iloc[:2], odd.iloc[2:]]))).sort_index()
+    assert streamed.equals(expected), "Chunked transform rejects or mangles odd IDs"
+    
+    with SpillSet(partitions=4) as spill:
+        spill.add(customers_dup['email'].iloc[:20])
+        spill.add(customers_dup['email'].iloc[20:])
+        assert spill.duplicate_count() == customers_dup['email'].duplicated().sum(), \
+            "Wrong spilled duplicate count"
+    
+    print("✅ Out-of-core dedup test passed")
+
+
+def test_benchmark_compare():
+    """Test query parsing and baseline comparison of the perf harness"""
+    print("\n🧪 Testing benchmark harness...")
+    
+    with open('sql/queries.sql') as f:
+        queries = parse_queries(f.read())
+    names = [name for name, _ in queries]
+    assert 'Customer count by country' in names, "Query names not parsed"
+    assert all(sql.lstrip().upper().startswith('SELECT') for _, sql in queries), "Bad query split"
+    
+    baseline = {
+        'queries': {'q': {'execution_ms': 100.0, 'indexes': ['idx_a']}},
+        'loads': {'load_customers': {'rows_per_sec': 1000.0}},
+    }
+    same = {
+        'queries': {'q': {'execution_ms': 110.0, 'indexes': ['idx_a']}},
+        'loads': {'load_customers': {'rows_per_sec': 900.0}},
+    }
+    worse = {
+        'queries': {'q': {'execution_ms': 200.0, 'indexes': []}},
+        'loads': {'load_customers': {'rows_per_sec': 500.0}},
+    }
+    assert compare(same, baseline) == [], "Flagged a change within tolerance"
+    assert len(compare(worse, baseline)) == 3, "Missed regressions"
+    missing = {'queries': same['queries'], 'loads': {}}
+    assert compare(missing, baseline) == ['load_customers: load path missing from results'], \
+        "Missing load path not reported"
+    
+    print("✅ Benchmark harness test passed")
+
+
+def test_config_overrides():
+    """Test typed, cached config with per-scope overrides"""
+    print("\n🧪 Testing config...")
+    import os
+    import pickle
+    
+    overrides = {'BATCH_SIZE': '800', 'CUSTOMERS_BATCH_SIZE': '2000', 'LOAD_CHUNK_SIZE': 'lots',
+                 'CUSTOMERS_MIN_BATCH_SIZE': '20000', 'DB_PORT': '6543', 'TRANSFORM_SPILL_PARTITIONS': '8',
+                 'EXTRACT_BATCH_TARGET_LATENCY': 'nan', 'VALIDATE_BATCH_TARGET_LATENCY': 'inf',
+                 'EXTRACT_DB_PORT': '70000'}
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        cfg = Config()
+        assert cfg.get('BATCH_SIZE') == 800, "Global setting not read"
+        assert cfg.get('BATCH_SIZE', 'customers', 'load') == 2000, "Source override ignored"
+        assert cfg.get('BATCH_SIZE', 'products', 'load') == 800, "Fallback to global failed"
+        assert cfg.API_TIMEOUT == 30, "Default not used"
+        assert cfg.DB_PORT == 6543, "DB_PORT not parsed as int"
+        assert cfg.batch_settings('products', 'load')['initial_size'] == 800, "Wrong batch settings"
+        assert cfg.get('SPILL_PARTITIONS', 'customers', 'transform') == 8, "Stage override ignored"
+        assert cfg.get('SPILL_PARTITIONS', 'customers', 'validate') == 64, "Wrong spill partition default"
+        
+        try:
+            cfg.batch_settings('customers', 'load')
+            assert False, "MIN_BATCH_SIZE > MAX_BATCH_SIZE accepted"
+        except ValueError:
+            pass
+        
+        try:
+            cfg.get('CHUNK_SIZE', 'load')
+            assert False, "Invalid int accepted"
+        except ValueError:
+            pass
+        
+        for name, scope in [('BATCH_TARGET_LATENCY', 'extract'), ('BATCH_TARGET_LATENCY', 'validate'),
+                            ('DB_PORT', 'extract')]:
+            try:
+                cfg.get(name, scope)
+                assert False, f"Out-of-range {scope.upper()}_{name} accepted"
+            except ValueError:
+                pass
+        
+        # Values are read once; a worker gets them without re-reading the env
+        os.environ['BATCH_SIZE'] = '1'
+        assert cfg.get('BATCH_SIZE') == 800, "Setting was not cached"
+        worker_cfg = pickle.loads(pickle.dumps(cfg))
+        assert worker_cfg.get('BATCH_SIZE', 'products') == 800, "Worker re-read the env"
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    
+    print("✅ Config test passed")
+
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "="*60)
@@ -77,6 +367,12 @@ def run_all_tests():
         test_api_extraction()
         test_transformation()
         test_validation()
+        test_adaptive_batching()
+        test_daemon_metrics()
+        test_normalization()
+        test_out_of_core_dedup()
+        test_benchmark_compare()
+        test_config_overrides()
         
         print("\n" + "="*60)
         print("✅ ALL TESTS PASSED")